@@ -21,16 +21,26 @@ Requirements:
 
 import sys
 import os
+import io
+import re
+import mmap
+import struct
+import contextlib
 import datetime
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC
-from typing import List, Tuple, Optional
+from functools import partial
+from typing import List, Tuple, Optional, Union
 from pathlib import Path
 
 # CRS archive file block signature - 'MDmd' in ASCII
 MDMD_SIGNATURE = b'MDmd'
+_MDMD_RE = re.compile(re.escape(MDMD_SIGNATURE))
 OFFSET_AFTER_PATTERN = 0x2A
 NAME_LEN = 17
 HEADER_SIZE = 122  # CRS archive header size in bytes
+# Archive header bytes 0x31-0x79: spaces, null separator at 0x36, spaces
+_HEADER_PAD_BLOCK = b'\x20' * 5 + b'\x00' + b'\x20' * (0x7A - 0x37)
 TIME_OFFSET = datetime.timedelta(hours=4, minutes=30)
 
 # Configurable list of files to remove from CRS archive - users can easily add more
@@ -40,35 +50,27 @@ FILES_TO_REMOVE = [
     # Add more file signatures here as needed:
 ]
 
-def get_file_modification_time(filepath: str) -> datetime.datetime:
-    """Get file modification time in UTC using cross-platform methods."""
-    mod_time_seconds = os.path.getmtime(filepath)
-    return datetime.datetime.fromtimestamp(mod_time_seconds, UTC)
-
-def find_all_mdmd_patterns(data: bytearray) -> List[int]:
-    """Find all MDmd pattern positions using optimized scanning."""
-    positions: List[int] = []
-    pos = 0
-    while pos < len(data):
-        index = data.find(MDMD_SIGNATURE, pos)
-        if index == -1:
-            break
-        positions.append(index)
-        pos = index + 1
-    return positions
+_EXCLUDE_BYTES_UPPER = frozenset(sig.upper() for sig in FILES_TO_REMOVE)
+
+def find_all_mdmd_patterns(data: Union[bytes, bytearray, mmap.mmap]) -> List[int]:
+    """Find all MDmd pattern positions in a single C-level regex scan."""
+    # 'MDmd' cannot overlap itself, so non-overlapping matches find every hit
+    return [match.start() for match in _MDMD_RE.finditer(data)]
 
-def remove_files_from_archive(data: bytearray, pattern_positions: List[int], files_to_remove: Optional[List[bytes]] = None) -> bytearray:
+def remove_files_from_archive(data: Union[bytes, bytearray, mmap.mmap], pattern_positions: List[int], files_to_remove: Optional[List[bytes]] = None) -> Tuple[bytearray, List[Tuple[int, int]]]:
     """
-    Remove specified files from CRS archive using reverse-order deletion.
+    Remove specified files from CRS archive using a single-pass copy.
     
-    Identifies file blocks by signatures and removes them entirely while
-    maintaining correct indices during the removal process.
+    Identifies file blocks by signatures and joins only the surviving
+    spans into a new buffer, so each byte is moved once.
+    Returns the cleaned data as a new bytearray, so the input may be a
+    read-only mapping, along with the sorted (start, end) spans removed.
     """
     if files_to_remove is None:
         files_to_remove = FILES_TO_REMOVE
     
     if not files_to_remove or not pattern_positions:
-        return data
+        return bytearray(data), []
     
     files_to_delete: List[Tuple[int, int, str]] = []
     
@@ -76,9 +78,9 @@ def remove_files_from_archive(data: bytearray, pattern_positions: List[int], fil
         file_start = pattern_pos
         file_end = pattern_positions[i + 1] if i + 1 < len(pattern_positions) else len(data)
         
-        file_data = data[file_start:file_end]
+        # Search the block in place instead of slicing a copy of it
         for signature in files_to_remove:
-            if signature in file_data:
+            if data.find(signature, file_start, file_end) != -1:
                 filename = signature.decode('ascii', errors='ignore')
                 print(f"Removing file: {filename} (0x{file_start:06X}-0x{file_end:06X})")
                 files_to_delete.append((file_start, file_end, filename))
@@ -86,65 +88,87 @@ def remove_files_from_archive(data: bytearray, pattern_positions: List[int], fil
     
     if not files_to_delete:
         print("No files found matching the specified signatures")
-        return data
+        return bytearray(data), []
     
-    # Remove in reverse order to maintain indices
-    files_to_delete.sort(key=lambda x: x[0], reverse=True)
-    cleaned_data = data[:]
+    # Collect the spans between removed blocks and copy them in one forward pass
+    keep_spans: List[Tuple[int, int]] = []
+    keep_start = 0
+    for file_start, file_end, _ in files_to_delete:
+        keep_spans.append((keep_start, file_start))
+        keep_start = file_end
+    keep_spans.append((keep_start, len(data)))
     
-    for file_start, file_end, filename in files_to_delete:
-        del cleaned_data[file_start:file_end]
+    with memoryview(data) as data_mv:
+        cleaned_data = bytearray().join(data_mv[start:end] for start, end in keep_spans)
     
     print(f"Removed {len(files_to_delete)} files from archive")
-    return cleaned_data
-
-def process_archive(filepath: str) -> Tuple[List[bytearray], bytearray, int, List[int]]:
-    """Process CRS archive: remove unwanted files and generate index blocks."""
-    with open(filepath, 'rb') as f:
-        data = bytearray(f.read())
-
-    # Remove unwanted files
-    all_positions = find_all_mdmd_patterns(data)
-    data = remove_files_from_archive(data, all_positions)
+    return cleaned_data, [(file_start, file_end) for file_start, file_end, _ in files_to_delete]
 
-    # Build final index after file removal
-    positions = find_all_mdmd_patterns(data)
-    index_blocks: List[bytearray] = []
+def _shift_positions(positions: List[int], removed_spans: List[Tuple[int, int]]) -> List[int]:
+    """Map MDmd positions onto the cleaned archive, dropping removed blocks."""
+    shifted: List[int] = []
+    shift = 0
+    span_index = 0
+    for pos in positions:
+        while span_index < len(removed_spans) and removed_spans[span_index][1] <= pos:
+            span_start, span_end = removed_spans[span_index]
+            shift += span_end - span_start
+            span_index += 1
+        if span_index < len(removed_spans) and removed_spans[span_index][0] <= pos:
+            continue
+        shifted.append(pos - shift)
+    return shifted
+
+def process_archive(filepath: str) -> Tuple[bytearray, bytearray, int, List[int]]:
+    """Process CRS archive: remove unwanted files and generate the index table."""
+    # Scan the archive straight from the page cache; the only heap copy
+    # is the cleaned output built by remove_files_from_archive
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        all_positions = find_all_mdmd_patterns(mapped)
+        data, removed_spans = remove_files_from_archive(mapped, all_positions)
+
+    # Build final index after file removal, reusing the first scan
+    positions = _shift_positions(all_positions, removed_spans)
+    entry_names: List[bytes] = []
     final_positions: List[int] = []
-    filenames_to_exclude = {sig.decode('ascii', errors='ignore').upper() for sig in FILES_TO_REMOVE}
+    data_mv = memoryview(data)
 
     for pos in positions:
         name_start = pos + OFFSET_AFTER_PATTERN
-        name_end = name_start + 32
-        name_bytes = data[name_start:name_end].split(b'\x20', 1)[0][:13]
+        # Name runs up to the first space, capped at 13 bytes
+        name_end = data.find(b'\x20', name_start, name_start + 13)
+        if name_end == -1:
+            name_end = name_start + 13
+        name_bytes = bytes(data_mv[name_start:name_end])
         
-        filename_ascii = name_bytes.decode('ascii', errors='ignore').upper()
-        if filename_ascii in filenames_to_exclude:
+        if name_bytes.upper() in _EXCLUDE_BYTES_UPPER:
             continue
         
-        index_block = bytearray(NAME_LEN)
-        index_block[:len(name_bytes)] = name_bytes
-        index_blocks.append(index_block)
+        entry_names.append(name_bytes)
         final_positions.append(pos)
 
-    # Calculate and update offsets
-    file_count = len(index_blocks)
+    # Calculate offsets and fill the index table in one preallocated buffer
+    file_count = len(entry_names)
     base_offset = (file_count * NAME_LEN) + HEADER_SIZE
 
     print(f"Processing {file_count} files")
     print(f"Base offset: 0x{base_offset:X}")
 
-    for index_block, pos in zip(index_blocks, final_positions):
+    index_table = bytearray(file_count * NAME_LEN)
+    for entry_start, name_bytes, pos in zip(range(0, len(index_table), NAME_LEN), entry_names, final_positions):
         final_offset = pos + base_offset
-        index_block[13:16] = final_offset.to_bytes(3, byteorder='little')
+        index_table[entry_start:entry_start + len(name_bytes)] = name_bytes
+        # 24-bit little-endian offset, written as low word + high byte
+        struct.pack_into('<HB', index_table, entry_start + 13, final_offset & 0xFFFF, final_offset >> 16)
 
-    return index_blocks, data, file_count, final_positions
+    return index_table, data, file_count, final_positions
 
-def build_header_dynamically(file_count: int, filepath: str) -> Tuple[bytearray, int, int]:
+def build_header_dynamically(file_count: int, mtime: float) -> Tuple[bytearray, int, int]:
     """
     Build CRS archive header dynamically.
     
-    Creates a 122-byte header following the CRS format specification.
+    Creates a 122-byte header following the CRS format specification,
+    stamped with the source file's modification time (seconds since epoch).
     See README.md for detailed format documentation.
     """
     header = bytearray(HEADER_SIZE)
@@ -153,32 +177,26 @@ def build_header_dynamically(file_count: int, filepath: str) -> Tuple[bytearray,
     header[0x00:0x04] = MDMD_SIGNATURE
     header[0x04] = 0x0A  # ReleaseLevel (v1.0)
     header[0x05] = 0x01  # HeaderType
-    header[0x06:0x08] = HEADER_SIZE.to_bytes(2, byteorder='little')
+    struct.pack_into('<H', header, 0x06, HEADER_SIZE)
     
     # File count and index table sizes
-    header[0x0A:0x0C] = file_count.to_bytes(2, byteorder='little')
-    table_size_bytes = (file_count * NAME_LEN).to_bytes(2, byteorder='little')
-    header[0x19:0x1B] = table_size_bytes
-    header[0x1D:0x1F] = table_size_bytes
+    struct.pack_into('<H', header, 0x0A, file_count)
+    struct.pack_into('<H', header, 0x19, file_count * NAME_LEN)
+    struct.pack_into('<H', header, 0x1D, file_count * NAME_LEN)
     
     # File timestamps (MS-DOS format)
-    mod_date = get_file_modification_time(filepath) + TIME_OFFSET
+    mod_date = datetime.datetime.fromtimestamp(mtime, UTC) + TIME_OFFSET
     dos_year = mod_date.year - 1980
     dos_date = (dos_year << 9) | (mod_date.month << 5) | mod_date.day
     dos_time = (mod_date.hour << 11) | (mod_date.minute << 5) | (mod_date.second // 2)
-    header[0x23:0x25] = dos_time.to_bytes(2, byteorder='little')
-    header[0x25:0x27] = dos_date.to_bytes(2, byteorder='little')
+    struct.pack_into('<HH', header, 0x23, dos_time, dos_date)
     
     # Index identifier with length prefix
     header[0x29] = 0x07
     header[0x2A:0x31] = b'~INDEX~'
     
     # Padding pattern
-    for i in range(0x31, 0x36):
-        header[i] = 0x20
-    header[0x36] = 0x00
-    for i in range(0x37, 0x7A):
-        header[i] = 0x20
+    header[0x31:0x7A] = _HEADER_PAD_BLOCK
     
     return header, dos_time, dos_date
 
@@ -209,22 +227,22 @@ def replace_internal_paths(data: bytearray, target_path: str = "C:\\LINKS\\TEMP\
         data[path_start:path_end] = path_segment
         total_replacements += 1
 
-        # Pad remaining space with spaces
-        pos = path_end
-        while pos < len(data) and data[pos] != 0x20:
-            data[pos] = 0x20
-            pos += 1
+        # Pad remaining space up to the next existing space in one slice write
+        pad_end = data.find(b'\x20', path_end)
+        if pad_end == -1:
+            pad_end = len(data)
+        data[path_end:pad_end] = b'\x20' * (pad_end - path_end)
 
         search_pos = pattern_pos + 1
 
     print(f"Path replacements: {total_replacements}")
     return data
 
-def assemble_and_save(header: bytearray, index_blocks: List[bytearray], data: bytearray, original_filename: str, output_dir: Optional[str] = None) -> str:
-    """Assemble and save the patched CRS file with optional output directory."""
-    index_table = b''.join(index_blocks)
-    new_content = bytearray(header + index_table + data)
-    new_content = replace_internal_paths(new_content)
+def assemble_and_save(header: bytearray, index_table: bytearray, data: bytearray, original_filename: str, output_dir: Optional[str] = None, original_stat: Optional[os.stat_result] = None) -> str:
+    """Assemble and save the patched CRS file, reusing the original's stat result when given."""
+    # Copy each part once into a single output buffer, then patch paths in place
+    new_content = bytearray().join((header, index_table, data))
+    replace_internal_paths(new_content)
 
     new_filename = _get_output_path(original_filename, "_patched", output_dir)
     
@@ -232,13 +250,13 @@ def assemble_and_save(header: bytearray, index_blocks: List[bytearray], data: by
         f.write(new_content)
 
     # Preserve timestamps
-    stat = os.stat(original_filename)
+    stat = original_stat if original_stat is not None else os.stat(original_filename)
     os.utime(new_filename, (stat.st_atime, stat.st_mtime))
 
     print(f"Modified file saved as: {os.path.abspath(new_filename)}")
     return str(new_filename)
 
-def generate_log(index_blocks: List[bytearray], positions: List[int], base_offset: int, original_filename: str, file_count: int, dos_time: int, dos_date: int, log_dir: Optional[str] = None) -> None:
+def generate_log(index_table: bytearray, positions: List[int], base_offset: int, original_filename: str, file_count: int, dos_time: int, dos_date: int, log_dir: Optional[str] = None) -> None:
     """Generate processing log with optional log directory."""
     log_lines: List[str] = [
         "Generated index summary",
@@ -256,7 +274,8 @@ def generate_log(index_blocks: List[bytearray], positions: List[int], base_offse
         ""
     ])
 
-    for i, (index_block, original_offset) in enumerate(zip(index_blocks, positions)):
+    for i, original_offset in enumerate(positions):
+        index_block = index_table[i * NAME_LEN:(i + 1) * NAME_LEN]
         adjusted = original_offset + base_offset
         hex_block = index_block.hex().upper()
         try:
@@ -300,10 +319,10 @@ def find_crs_files(path: str) -> List[str]:
             print(f"Warning: {path} is not a CRS file")
             return []
     elif path_obj.is_dir():
-        crs_files: List[Path] = []
-        for pattern in ['*.crs', '*.CRS']:
-            crs_files.extend(list(path_obj.glob(pattern)))
-        return [str(f) for f in sorted(crs_files)]
+        # Single directory pass with a case-insensitive extension check
+        with os.scandir(path_obj) as entries:
+            return sorted(str(path_obj / entry.name) for entry in entries
+                          if entry.is_file() and entry.name.upper().endswith('.CRS'))
     else:
         print(f"Error: {path} is not a valid file or directory")
         return []
@@ -315,11 +334,13 @@ def process_single_file(filepath: str, output_dir: Optional[str] = None, log_dir
         print(f"Processing: {os.path.basename(filepath)}")
         print(f"{'='*60}")
         
-        index_blocks, filtered_data, file_count, positions = process_archive(filepath)
-        header, dos_time, dos_date = build_header_dynamically(file_count, filepath)
-        assemble_and_save(header, index_blocks, filtered_data, filepath, output_dir)
+        # Stat once; the header timestamp and the output's preserved times share it
+        original_stat = os.stat(filepath)
+        index_table, filtered_data, file_count, positions = process_archive(filepath)
+        header, dos_time, dos_date = build_header_dynamically(file_count, original_stat.st_mtime)
+        assemble_and_save(header, index_table, filtered_data, filepath, output_dir, original_stat)
         base_offset = (file_count * NAME_LEN) + HEADER_SIZE
-        generate_log(index_blocks, positions, base_offset, filepath, file_count, dos_time, dos_date, log_dir)
+        generate_log(index_table, positions, base_offset, filepath, file_count, dos_time, dos_date, log_dir)
         
         print(f"✓ Successfully processed {os.path.basename(filepath)}")
         return True
@@ -328,8 +349,15 @@ def process_single_file(filepath: str, output_dir: Optional[str] = None, log_dir
         print(f"✗ Error processing {os.path.basename(filepath)}: {str(e)}")
         return False
 
+def _process_file_captured(filepath: str, output_dir: Optional[str] = None, log_dir: Optional[str] = None) -> Tuple[bool, str]:
+    """Worker wrapper that captures a file's console output so batch logs stay in order."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success = process_single_file(filepath, output_dir, log_dir)
+    return success, output.getvalue()
+
 def process_batch(file_paths: List[str], create_directories: bool = True) -> Tuple[int, int]:
-    """Process multiple CRS files with organized output structure."""
+    """Process multiple CRS files in parallel with organized output structure."""
     if not file_paths:
         print("No CRS files found to process")
         return 0, 0
@@ -347,9 +375,21 @@ def process_batch(file_paths: List[str], create_directories: bool = True) -> Tup
         print(f"Output directory: {os.path.abspath(output_dir)}")
         print(f"Log directory: {os.path.abspath(log_dir)}")
     
-    for filepath in file_paths:
-        if process_single_file(filepath, output_dir, log_dir):
-            successful += 1
+    max_workers = min(total, os.cpu_count() or 1)
+    if max_workers == 1:
+        # Nothing to parallelise; skip the cost of starting a worker process
+        for filepath in file_paths:
+            if process_single_file(filepath, output_dir, log_dir):
+                successful += 1
+    else:
+        # Files are independent, so patch them across worker processes and
+        # replay each file's captured output in input order
+        worker = partial(_process_file_captured, output_dir=output_dir, log_dir=log_dir)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for success, output in executor.map(worker, file_paths):
+                print(output, end='')
+                if success:
+                    successful += 1
     
     # Summary
     print(f"\n{'='*60}")